@@ -27,11 +27,18 @@ type Client struct {
 
 // Message represents the WebSocket message structure
 type Message struct {
-	Type      string `json:"type"`
-	Token     string `json:"token,omitempty"`
-	PeerToken string `json:"peerToken,omitempty"`
-	SDP       string `json:"sdp,omitempty"`
-	ICE       string `json:"ice,omitempty"`
+	Type      string          `json:"type"`
+	Token     string          `json:"token,omitempty"`
+	PeerToken string          `json:"peerToken,omitempty"`
+	SDP       json.RawMessage `json:"sdp,omitempty"` // Session description, forwarded without decoding
+	ICE       json.RawMessage `json:"ice,omitempty"` // ICE candidate, forwarded without decoding
+}
+
+// peerNotFound is sent when a message names a token that isn't connected;
+// error text travels in the sdp field
+var peerNotFound = Message{
+	Type: "error",
+	SDP:  json.RawMessage(`"Peer not found"`),
 }
 
 // ConfigResponse represents the configuration returned to clients
@@ -48,13 +55,12 @@ var (
 	}
 	mutex      = &sync.Mutex{}
 	stunServers []string
+	configJSON  []byte // Encoded ConfigResponse, built once at startup
 )
 
 func handleConfig(w http.ResponseWriter, r *http.Request) {
 	w.Header().Set("Content-Type", "application/json")
-	json.NewEncoder(w).Encode(ConfigResponse{
-		StunServers: stunServers,
-	})
+	w.Write(configJSON)
 }
 
 func main() {
@@ -81,6 +87,15 @@ func main() {
 		}
 	}
 
+	// The config never changes after startup, so encode it once instead of per request
+	var err error
+	configJSON, err = json.Marshal(ConfigResponse{
+		StunServers: stunServers,
+	})
+	if err != nil {
+		log.Fatal("Failed to encode config:", err)
+	}
+
 	// Set up config endpoint
 	http.HandleFunc("/api/config", handleConfig)
 
@@ -219,10 +234,7 @@ func handleConnect(client *Client, peerToken string) {
 
 	if !exists {
 		// Peer not found
-		client.conn.WriteJSON(Message{
-			Type: "error",
-			SDP:  "Peer not found",
-		})
+		client.conn.WriteJSON(peerNotFound)
 		return
 	}
 
@@ -242,10 +254,7 @@ func handleAccept(client *Client, peerToken string) {
 	mutex.Unlock()
 
 	if !exists {
-		client.conn.WriteJSON(Message{
-			Type: "error",
-			SDP:  "Peer not found",
-		})
+		client.conn.WriteJSON(peerNotFound)
 		return
 	}
 
@@ -278,10 +287,7 @@ func forwardOffer(client *Client, msg Message) {
 	mutex.Unlock()
 
 	if !exists {
-		client.conn.WriteJSON(Message{
-			Type: "error",
-			SDP:  "Peer not found",
-		})
+		client.conn.WriteJSON(peerNotFound)
 		return
 	}
 
@@ -299,10 +305,7 @@ func forwardAnswer(client *Client, msg Message) {
 	mutex.Unlock()
 
 	if !exists {
-		client.conn.WriteJSON(Message{
-			Type: "error",
-			SDP:  "Peer not found",
-		})
+		client.conn.WriteJSON(peerNotFound)
 		return
 	}
 
@@ -320,10 +323,7 @@ func forwardICE(client *Client, msg Message) {
 	mutex.Unlock()
 
 	if !exists {
-		client.conn.WriteJSON(Message{
-			Type: "error",
-			SDP:  "Peer not found",
-		})
+		client.conn.WriteJSON(peerNotFound)
 		return
 	}
 
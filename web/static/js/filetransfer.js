@@ -10,6 +10,7 @@ class FileTransfer {
         
         // Multiple transfer support
         this.activeTransfers = new Map(); // transferId -> transferData
+        this.receiveTransfersByNumericId = new Map(); // numeric transfer ID from chunk headers -> transferData
         this.nextTransferId = 1;
         
         // Legacy single transfer state (for backward compatibility)
@@ -30,13 +31,21 @@ class FileTransfer {
         this.sentChunks = 0;
         this.receivedChunks = 0;
         this.lastProgressUpdate = 0;
+        this.progressEmitInterval = 100; // Emit receive progress to the UI at most 10 times per second
         this.transferCancelled = false;
         
         // Legacy window control - REMOVED for multiple transfer support
         // Per-transfer flow control is now handled in transferData objects
-        this.windowSize = 128; // Default values for new transfers
+        this.windowSize = 128; // Chunk counts for the legacy single-transfer path
         this.minWindowSize = 32;
         this.maxWindowSize = 512;
+        
+        // Per-transfer windows are sized in bytes in flight, so they cover the same
+        // bandwidth-delay product whatever chunk size was negotiated
+        this.windowBytes = 8 * 1024 * 1024;
+        this.minWindowBytes = 2 * 1024 * 1024;
+        this.maxWindowBytes = 32 * 1024 * 1024;
+        this.flowControlAckDelay = 5; // ms; acks for chunks arriving within this interval go out as one message
         // this.inFlightChunks = 0; // REMOVED - now per-transfer
         // this.lastAcknowledged = -1; // REMOVED - now per-transfer
         
@@ -50,11 +59,15 @@ class FileTransfer {
         this.consecutiveDecreases = 0;
         
         // Congestion control
-        // CRITICAL FIX: Reduced buffer threshold from 2MB to 512KB for better flow control
-        // This triggers buffer management earlier and prevents saturation
-        this.bufferThreshold = this.p2p.DATA_BUFFER_SIZE || (512 * 1024); // Use configured data buffer size, reduced to 512KB for better flow control
+        // Sending pauses above this high-water mark and resumes on the channel's bufferedamountlow event
+        this.bufferThreshold = this.p2p.DATA_BUFFER_SIZE || (2 * 1024 * 1024); // Use configured data buffer size (2MB)
         this.sendPaused = false;
         
+        // File reads for sending: 4MB windows, two kept in flight ahead of the send loop
+        this.readWindowSize = 4 * 1024 * 1024;
+        this.readAheadDepth = 2;
+        this.singleReadMaxSize = 8 * 1024 * 1024; // Files up to this size are read in one go
+        
         // Speed calculation tracking
         this.lastSpeedCalculationTime = 0;
         this.lastBytesReceived = 0;
@@ -69,17 +82,12 @@ class FileTransfer {
         this.onVerificationFailed = null;
         
         // Set up control message handler
-        this.p2p.onControlMessage = (message) => {
-            if (message.type === 'flow-control-ack') {
-                this.logger.log('DEBUG: FileTransfer received flow-control-ack:', message);
-            }
-            this._handleControlMessage(message);
-        };
+        this.p2p.onControlMessage = (message) => this._handleControlMessage(message);
         
         // Set up data message handler
         this.p2p.onDataMessage = (data) => this._handleDataMessage(data);
         
-        this.logger.log('DEBUG: FileTransfer callbacks set up. p2p object:', this.p2p ? 'exists' : 'null');
+        this.logger.debug('FileTransfer callbacks set up. p2p object:', this.p2p ? 'exists' : 'null');
     }
 
     /**
@@ -124,6 +132,10 @@ class FileTransfer {
         const numericId = this.nextTransferId++;
         const transferId = `send-${numericId}`;
         
+        // Convert the byte-sized flow control window to chunks
+        const chunkSize = this.p2p.negotiatedChunkSize;
+        const chunksForBytes = (bytes) => Math.max(1, Math.floor(bytes / chunkSize));
+        
         // Create transfer data object
         const transferData = {
             id: transferId,
@@ -137,20 +149,21 @@ class FileTransfer {
             startTime: Date.now(),
             chunkSize: this.p2p.negotiatedChunkSize,
             totalBytes: file.size,
-            totalChunks: Math.ceil(file.size / this.chunkSize),
+            totalChunks: Math.ceil(file.size / this.p2p.negotiatedChunkSize),
             inFlightChunks: 0,
             lastAcknowledged: -1,
             sendPaused: false,
-            windowSize: this.windowSize,
-            minWindowSize: this.minWindowSize,
-            maxWindowSize: this.maxWindowSize,
+            windowSize: chunksForBytes(this.windowBytes),
+            minWindowSize: chunksForBytes(this.minWindowBytes),
+            maxWindowSize: chunksForBytes(this.maxWindowBytes),
             consecutiveIncreases: 0,
             consecutiveDecreases: 0,
             lastWindowAdjustment: Date.now(),
             speedHistory: [],
             lastSpeedCalculationTime: 0,
             lastBytesReceived: 0,
-            sendLoopPromise: null
+            sendLoopPromise: null,
+            rejectSend: null
         };
         
         // Store transfer data
@@ -176,14 +189,16 @@ class FileTransfer {
         this.logger.log(`Total chunks: ${this.totalChunks}`);
         
         try {
-            // Calculate MD5 hash
-            const md5Hash = await this._calculateMD5(file);
+            // The MD5 hash is computed while sending and delivered with file-complete
+            if (typeof SparkMD5 === 'undefined') {
+                throw new Error('SparkMD5 library not loaded');
+            }
             
             // Send file info with transfer ID
             this.fileInfo = {
                 name: file.name,
                 size: file.size,
-                md5: md5Hash,
+                chunkSize: transferData.chunkSize,
                 transferId: transferId
             };
             
@@ -193,6 +208,9 @@ class FileTransfer {
             this._startTransferSendLoop(transferData);
             
             return new Promise((resolve, reject) => {
+                // Kept so a peer disconnect can settle this transfer's promise
+                transferData.rejectSend = reject;
+                
                 // Set up completion handler
                 const originalOnComplete = this.onComplete;
                 this.onComplete = () => {
@@ -237,8 +255,12 @@ class FileTransfer {
                 }
                 
                 if (transferData.receiving) {
-                    transferData.receiving = false;
-                    transferData.fileData = null;
+                    this._endReceiveTransfer(transferData);
+                }
+                
+                // Wake a send loop waiting for window space so it can exit
+                if (transferData.windowSpaceResolve) {
+                    transferData.windowSpaceResolve();
                 }
                 
                 // Notify peer about cancellation
@@ -264,8 +286,10 @@ class FileTransfer {
                         tdata.sending = false;
                     }
                     if (tdata.receiving) {
-                        tdata.receiving = false;
-                        tdata.fileData = null;
+                        this._endReceiveTransfer(tdata);
+                    }
+                    if (tdata.windowSpaceResolve) {
+                        tdata.windowSpaceResolve();
                     }
                     this._sendCancellationForTransfer(tid);
                 }
@@ -289,19 +313,59 @@ class FileTransfer {
         }
     }
 
+    /**
+     * Stop all transfers after the peer connection has gone away. Nothing is sent to the
+     * peer; timers are cleared, waiting send loops are woken so they can exit, and pending
+     * sendFile promises are rejected.
+     */
+    abortAllTransfers() {
+        for (const transferData of this.activeTransfers.values()) {
+            transferData.transferCancelled = true;
+            transferData.sending = false;
+            
+            if (transferData.windowSpaceResolve) {
+                transferData.windowSpaceResolve();
+            }
+            
+            if (transferData.rejectSend) {
+                transferData.rejectSend(new Error('Peer disconnected'));
+            }
+            
+            if (transferData.completionTimeout) {
+                clearTimeout(transferData.completionTimeout);
+                transferData.completionTimeout = null;
+            }
+            
+            if (transferData.receiving) {
+                this._endReceiveTransfer(transferData);
+            }
+        }
+        this.activeTransfers.clear();
+        
+        // Legacy state
+        if (this.completionTimeout) {
+            clearTimeout(this.completionTimeout);
+            this.completionTimeout = null;
+        }
+        this.transferCancelled = true;
+        this.sending = false;
+        this.receiving = false;
+        this.fileData = null;
+    }
+
     /**
      * Send file info to the peer
      * @param {Object} fileInfo - The file info object
      * @private
      */
     _sendFileInfo(fileInfo) {
-        const message = {
+        const message = JSON.stringify({
             type: 'file-info',
             info: fileInfo
-        };
+        });
         
-        this.p2p.controlChannel.send(JSON.stringify(message));
-        this.logger.log('Sent file info:', fileInfo);
+        this.p2p.controlChannel.send(message);
+        this.logger.log('Sent file info:', message);
     }
     
     /**
@@ -311,14 +375,14 @@ class FileTransfer {
      * @private
      */
     _sendFileInfoForTransfer(fileInfo, transferId) {
-        const message = {
+        const message = JSON.stringify({
             type: 'file-info',
             transferId: transferId,
             info: fileInfo
-        };
+        });
         
-        this.p2p.controlChannel.send(JSON.stringify(message));
-        this.logger.log('Sent file info for transfer:', transferId, fileInfo);
+        this.p2p.controlChannel.send(message);
+        this.logger.log('Sent file info for transfer:', transferId, message);
     }
 
     _startTransferSendLoop(transferData) {
@@ -344,59 +408,53 @@ class FileTransfer {
             return;
         }
         
-        const reader = new FileReader();
+        // The file is read in multi-chunk windows; chunks are views into the window buffer.
+        // A small file is a single window, the same memory the read-ahead would hold anyway
+        const chunksPerWindow = transferData.file.size <= this.singleReadMaxSize
+            ? Math.max(1, transferData.totalChunks)
+            : Math.max(1, Math.floor(this.readWindowSize / transferData.chunkSize));
+        const totalWindows = Math.ceil(transferData.totalChunks / chunksPerWindow);
+        
+        // Hash each window as it is released so the file is only read once
+        const spark = new SparkMD5.ArrayBuffer();
+        
+        // One frame buffer reused for every chunk; send() copies the bytes it is given
+        const frame = new Uint8Array(12 + transferData.chunkSize);
+        const view = new DataView(frame.buffer);
+        
+        // Write transfer ID (4 bytes) once - CRITICAL FIX for multiple transfers
+        // The numeric ID was assigned with the transfer, so the string ID is never re-parsed
+        view.setUint32(0, transferData.numericId);
+        
+        // Window reads queued ahead of the sender so disk I/O overlaps with sending
+        const readAhead = [];
+        let nextReadWindow = 0;
         let transferSequence = 0;
         
         // Process chunks sequentially for this transfer
         while (transferSequence < transferData.totalChunks && !transferData.transferCancelled) {
+            // Top up the read-ahead queue before any waiting so reads progress in the meantime
+            while (readAhead.length < this.readAheadDepth && nextReadWindow < totalWindows) {
+                readAhead.push(this._readWindowForTransfer(transferData, nextReadWindow++, chunksPerWindow));
+            }
+            
             // Check if we need to pause sending due to buffer congestion
             const currentBufferedAmount = this.p2p.dataChannel ? this.p2p.dataChannel.bufferedAmount : 0;
             
-            // OPTIMIZATION: Use less conservative buffer management for better throughput
             if (currentBufferedAmount > this.bufferThreshold) {
                 transferData.sendPaused = true;
-                this.logger.log(`Buffer congestion for transfer ${transferData.id} - buffered: ${currentBufferedAmount}, threshold: ${this.bufferThreshold}`);
+                this.logger.debug(`Buffer congestion for transfer ${transferData.id} - buffered: ${currentBufferedAmount}, threshold: ${this.bufferThreshold}`);
                 
-                // Wait for buffer to clear - use 75% threshold instead of 50% for better flow
-                await new Promise(resolve => {
-                    const checkBuffer = () => {
-                        const newBufferedAmount = this.p2p.dataChannel ? this.p2p.dataChannel.bufferedAmount : 0;
-                        if (newBufferedAmount <= this.bufferThreshold * 0.75) {
-                            transferData.sendPaused = false;
-                            this.logger.log(`Resuming send for transfer ${transferData.id} - buffered: ${newBufferedAmount}`);
-                            resolve();
-                        } else {
-                            setTimeout(checkBuffer, 50); // Check more frequently
-                        }
-                    };
-                    
-                    setTimeout(checkBuffer, 50);
-                });
+                // Wait for the channel to signal that its buffer has drained instead of polling
+                await this._waitForBufferDrain();
+                
+                transferData.sendPaused = false;
+                this.logger.debug(`Resuming send for transfer ${transferData.id} - buffered: ${this.p2p.dataChannel ? this.p2p.dataChannel.bufferedAmount : 0}`);
             }
             
             // Check if we need to wait for window space - CRITICAL FIX: No recovery mechanism
             if (transferData.inFlightChunks >= transferData.windowSize) {
-                const waitStartTime = Date.now();
-                const timeoutMs = 10000; // Increased timeout to 10 seconds for stability
-                
-                await new Promise(resolve => {
-                    const checkWindow = () => {
-                        const elapsed = Date.now() - waitStartTime;
-                        
-                        if (transferData.inFlightChunks < transferData.windowSize) {
-                            resolve();
-                        } else if (elapsed > timeoutMs) {
-                            // CRITICAL FIX: Remove recovery mechanism that reduces in-flight chunks
-                            // This was causing conflicts between multiple transfers
-                            this.logger.error(`Window wait timeout for transfer ${transferData.id} after ${elapsed}ms - this should not happen`);
-                            resolve(); // Continue anyway to avoid deadlock
-                        } else {
-                            setTimeout(checkWindow, 50);
-                        }
-                    };
-                    
-                    setTimeout(checkWindow, 50);
-                });
+                await this._waitForWindowSpace(transferData);
             }
             
             // Check if transfer was cancelled during wait
@@ -404,41 +462,33 @@ class FileTransfer {
                 break;
             }
             
-            // Calculate chunk boundaries
-            const start = transferSequence * transferData.chunkSize;
-            const end = Math.min(start + transferData.chunkSize, transferData.file.size);
-            const chunkData = transferData.file.slice(start, end);
-            
-            // Read chunk data
-            const chunkArrayBuffer = await new Promise((resolve, reject) => {
-                reader.onload = (e) => resolve(e.target.result);
-                reader.onerror = (e) => reject(e);
-                reader.readAsArrayBuffer(chunkData);
-            });
+            // Slice the chunk out of the oldest prefetched window without copying
+            const windowBuffer = await readAhead[0];
             
-            // Create chunk with header including transfer ID
-            const chunk = new ArrayBuffer(12 + chunkArrayBuffer.byteLength);
-            const view = new DataView(chunk);
-            
-            // Write transfer ID (4 bytes) - CRITICAL FIX for multiple transfers
-            // Use direct string-to-number conversion instead of regex
-            const transferIdNum = this._extractTransferIdNumber(transferData.id);
-            view.setUint32(0, transferIdNum);
+            // The read may finish after the transfer was torn down
+            if (transferData.transferCancelled) {
+                break;
+            }
+            const windowOffset = (transferSequence % chunksPerWindow) * transferData.chunkSize;
+            const chunkBytes = new Uint8Array(windowBuffer, windowOffset,
+                Math.min(transferData.chunkSize, windowBuffer.byteLength - windowOffset));
             
+            // Fill in the per-chunk header fields; the transfer ID is already in place
             // Write sequence number (4 bytes)
             view.setUint32(4, transferSequence);
             
             // Write chunk size (4 bytes)
-            view.setUint32(8, chunkArrayBuffer.byteLength);
+            view.setUint32(8, chunkBytes.byteLength);
             
             // Copy chunk data (skip 12-byte header: 4 bytes transfer ID + 4 bytes sequence + 4 bytes chunk size)
-            new Uint8Array(chunk, 12).set(new Uint8Array(chunkArrayBuffer));
+            frame.set(chunkBytes, 12);
+            const chunk = chunkBytes.byteLength === transferData.chunkSize ? frame : frame.subarray(0, 12 + chunkBytes.byteLength);
             
             // Send chunk
             try {
                 this.p2p.dataChannel.send(chunk);
                 transferData.inFlightChunks++;
-                transferData.bytesSent += chunkArrayBuffer.byteLength;
+                transferData.bytesSent += chunkBytes.byteLength;
                 transferData.sentChunks++;
                 
                 // Update legacy state for backward compatibility
@@ -447,6 +497,7 @@ class FileTransfer {
                 
                 // Update progress
                 if (this.onProgress) {
+                    const elapsedMs = Date.now() - transferData.startTime;
                     const progress = {
                         transferId: transferData.id,
                         bytesSent: transferData.bytesSent,
@@ -454,9 +505,9 @@ class FileTransfer {
                         sentChunks: transferData.sentChunks,
                         totalChunks: transferData.totalChunks,
                         percent: (transferData.bytesSent / transferData.totalBytes) * 100,
-                        speed: transferData.bytesSent / ((Date.now() - transferData.startTime) / 1000),
-                        timeElapsed: (Date.now() - transferData.startTime) / 1000,
-                        timeRemaining: ((Date.now() - transferData.startTime) / transferData.bytesSent) * (transferData.totalBytes - transferData.bytesSent) / 1000,
+                        speed: transferData.bytesSent / (elapsedMs / 1000),
+                        timeElapsed: elapsedMs / 1000,
+                        timeRemaining: (elapsedMs / transferData.bytesSent) * (transferData.totalBytes - transferData.bytesSent) / 1000,
                         complete: transferData.transferComplete, // CRITICAL FIX: Include complete flag for UI synchronization
                         filename: transferData.file.name
                     };
@@ -465,11 +516,28 @@ class FileTransfer {
                 }
                 
                 transferSequence++;
+                
+                // Hash and release the window once its last chunk has been sent
+                if (transferSequence % chunksPerWindow === 0 || transferSequence === transferData.totalChunks) {
+                    spark.append(windowBuffer);
+                    readAhead.shift();
+                }
             } catch (error) {
                 this.logger.error(`Error sending chunk for transfer ${transferData.id}:`, error);
                 
-                // Retry after a short delay
-                await new Promise(resolve => setTimeout(resolve, 100));
+                // A closed channel will not recover, so stop instead of retrying
+                const channel = this.p2p.dataChannel;
+                if (!channel || channel.readyState !== 'open') {
+                    throw new Error('Data channel closed during transfer');
+                }
+                
+                if (channel.bufferedAmount > channel.bufferedAmountLowThreshold) {
+                    // The send queue is full; retry as soon as it has drained
+                    await this._waitForBufferDrain();
+                } else {
+                    // Retry after a short delay
+                    await new Promise(resolve => setTimeout(resolve, 100));
+                }
                 
                 // Don't increment sequence, so we retry the same chunk
                 continue;
@@ -478,10 +546,80 @@ class FileTransfer {
         
         // Send file complete message when all chunks are sent
         if (!transferData.transferCancelled) {
+            transferData.md5 = spark.end();
             this._sendFileCompleteForTransfer(transferData);
         }
     }
 
+    /**
+     * Read one window of consecutive chunks of a file being sent
+     * @param {Object} transferData - The transfer data
+     * @param {number} windowIndex - The index of the window to read
+     * @param {number} chunksPerWindow - The number of chunks in a window
+     * @returns {Promise<ArrayBuffer>} - Resolves with the window contents
+     * @private
+     */
+    _readWindowForTransfer(transferData, windowIndex, chunksPerWindow) {
+        const windowSize = chunksPerWindow * transferData.chunkSize;
+        const start = windowIndex * windowSize;
+        const end = Math.min(start + windowSize, transferData.file.size);
+        const read = transferData.file.slice(start, end).arrayBuffer();
+        
+        // Reads left queued by a cancelled transfer must not surface as unhandled rejections
+        read.catch(() => {});
+        return read;
+    }
+
+    /**
+     * Wait until acknowledgments open space in a transfer's flow control window
+     * @param {Object} transferData - The transfer data
+     * @returns {Promise} - Resolves when an ack or cancellation wakes the sender, or on timeout
+     * @private
+     */
+    _waitForWindowSpace(transferData) {
+        const timeoutMs = 10000; // Increased timeout to 10 seconds for stability
+        
+        return new Promise(resolve => {
+            const timeout = setTimeout(() => {
+                transferData.windowSpaceResolve = null;
+                // CRITICAL FIX: Remove recovery mechanism that reduces in-flight chunks
+                // This was causing conflicts between multiple transfers
+                this.logger.error(`Window wait timeout for transfer ${transferData.id} after ${timeoutMs}ms - this should not happen`);
+                resolve(); // Continue anyway to avoid deadlock
+            }, timeoutMs);
+            
+            transferData.windowSpaceResolve = () => {
+                clearTimeout(timeout);
+                transferData.windowSpaceResolve = null;
+                resolve();
+            };
+        });
+    }
+
+    /**
+     * Wait until the data channel send buffer drops below its low threshold
+     * @returns {Promise} - Resolves on bufferedamountlow or when the channel closes
+     * @private
+     */
+    _waitForBufferDrain() {
+        const channel = this.p2p.dataChannel;
+        if (!channel || channel.readyState !== 'open' ||
+            channel.bufferedAmount <= channel.bufferedAmountLowThreshold) {
+            return Promise.resolve();
+        }
+        
+        return new Promise(resolve => {
+            const done = () => {
+                channel.removeEventListener('bufferedamountlow', done);
+                channel.removeEventListener('close', done);
+                resolve();
+            };
+            
+            channel.addEventListener('bufferedamountlow', done);
+            channel.addEventListener('close', done);
+        });
+    }
+
     /**
      * Send file complete message to the peer
      * @private
@@ -489,7 +627,8 @@ class FileTransfer {
     _sendFileCompleteForTransfer(transferData) {
         const message = {
             type: 'file-complete',
-            transferId: transferData.id
+            transferId: transferData.id,
+            md5: transferData.md5
         };
         
         this.p2p.controlChannel.send(JSON.stringify(message));
@@ -581,8 +720,13 @@ class FileTransfer {
     _sendProgressUpdateForTransfer(transferId, transferData) {
         const now = Date.now();
         
-        // Send transfer-specific flow control acknowledgment (unthrottled)
-        this._sendFlowControlAckForTransfer(transferId, transferData);
+        // Acks are cumulative (highest sequence), so one ack covers a burst of chunks
+        if (!transferData.flowControlAckTimer) {
+            transferData.flowControlAckTimer = setTimeout(() => {
+                transferData.flowControlAckTimer = null;
+                this._sendFlowControlAckForTransfer(transferId, transferData);
+            }, this.flowControlAckDelay);
+        }
         
         // Send throttled progress updates only for user feedback
         if (now - transferData.lastProgressUpdate < 1000) {
@@ -615,11 +759,10 @@ class FileTransfer {
         // Use remoteTransferId if this is a received transfer, otherwise use local ID
         const msgTransferId = transferData.remoteTransferId || transferId;
         
-        const message = {
-            type: 'flow-control-ack',
-            transferId: msgTransferId,
-            highestSequence: transferData.highestSequence
-        };
+        // Acks go out up to once per flowControlAckDelay; encode the constant part of the frame once per transfer
+        if (!transferData.flowControlAckPrefix) {
+            transferData.flowControlAckPrefix = '{"type":"flow-control-ack","transferId":' + JSON.stringify(msgTransferId) + ',"highestSequence":';
+        }
         
         if (!this.p2p.controlChannel) {
             this.logger.error('DEBUG: Control channel is not available!');
@@ -631,16 +774,30 @@ class FileTransfer {
             return;
         }
         
-        this.p2p.controlChannel.send(JSON.stringify(message));
-        this.logger.log('DEBUG: Sent flow control acknowledgment for transfer:', msgTransferId, 'sequence:', transferData.highestSequence);
+        this.p2p.controlChannel.send(transferData.flowControlAckPrefix + transferData.highestSequence + '}');
+    }
+
+    /**
+     * Send a pending coalesced ack now so it reaches the sender before the verification result
+     * @param {string} transferId - The local transfer ID
+     * @param {Object} transferData - The transfer data
+     * @private
+     */
+    _flushFlowControlAckForTransfer(transferId, transferData) {
+        if (transferData.flowControlAckTimer) {
+            clearTimeout(transferData.flowControlAckTimer);
+            transferData.flowControlAckTimer = null;
+            this._sendFlowControlAckForTransfer(transferId, transferData);
+        }
     }
 
     /**
      * Handle file complete message for specific transfer
      * @param {string} transferId - The transfer ID from the remote peer
+     * @param {string} [md5] - The MD5 hash computed by the sender while sending
      * @private
      */
-    _handleFileCompleteForTransfer(transferId) {
+    _handleFileCompleteForTransfer(transferId, md5) {
         this.logger.log(`Received file complete message for transfer: ${transferId}`);
         
         // Convert remote transfer ID to local transfer ID (incoming transfers are prefixed with "recv-")
@@ -655,6 +812,11 @@ class FileTransfer {
         
         transferData.transferComplete = true;
         
+        // Senders hash while sending, so the expected hash arrives with file-complete
+        if (md5) {
+            transferData.file.md5 = md5;
+        }
+        
         // Check if we've received all data
         if (transferData.bytesReceived >= transferData.file.size) {
             // We have all data, proceed with verification
@@ -761,8 +923,7 @@ class FileTransfer {
         }
         
         if (transferData.receiving) {
-            transferData.receiving = false;
-            transferData.fileData = null;
+            this._endReceiveTransfer(transferData);
         }
         
         if (this.sending) {
@@ -790,7 +951,7 @@ class FileTransfer {
         };
         
         this.p2p.controlChannel.send(JSON.stringify(message));
-        this.logger.log('DEBUG: Sent flow control acknowledgment:', message, 'highestSequence:', this.highestSequence);
+        this.logger.debug('Sent flow control acknowledgment:', message, 'highestSequence:', this.highestSequence);
     }
     
     /**
@@ -805,7 +966,7 @@ class FileTransfer {
         };
         
         this.p2p.controlChannel.send(JSON.stringify(message));
-        this.logger.log('DEBUG: Sent immediate flow control ack for sequence:', sequence);
+        this.logger.debug('Sent immediate flow control ack for sequence:', sequence);
     }
 
     /**
@@ -825,7 +986,7 @@ class FileTransfer {
                 const newAcknowledged = ack.highestSequence - transfer.lastAcknowledged;
                 transfer.inFlightChunks = Math.max(0, transfer.inFlightChunks - newAcknowledged);
                 transfer.lastAcknowledged = ack.highestSequence;
-                this.logger.log('DEBUG: Transfer', transfer.id, 'updated - inFlightChunks:', transfer.inFlightChunks, 'lastAcknowledged:', transfer.lastAcknowledged);
+                this.logger.debug('Transfer', transfer.id, 'updated - inFlightChunks:', transfer.inFlightChunks, 'lastAcknowledged:', transfer.lastAcknowledged);
             }
         }
     }
@@ -852,7 +1013,10 @@ class FileTransfer {
         
         // CRITICAL FIX: Route messages with transfer IDs to transfer-specific handlers
         if (message.transferId) {
-            this.logger.log('DEBUG: Routing message with transferId:', message.type, message.transferId);
+            // Flow control acks arrive continuously during a transfer and are not logged
+            if (message.type !== 'flow-control-ack') {
+                this.logger.debug('Routing message with transferId:', message.type, message.transferId);
+            }
             switch (message.type) {
                 case 'file-info':
                     this._handleFileInfoForTransfer(message.info, message.transferId);
@@ -863,12 +1027,11 @@ class FileTransfer {
                     break;
                     
                 case 'flow-control-ack':
-                    this.logger.log('DEBUG: Calling _handleFlowControlAckForTransfer');
                     this._handleFlowControlAckForTransfer(message);
                     break;
                     
                 case 'file-complete':
-                    this._handleFileCompleteForTransfer(message.transferId);
+                    this._handleFileCompleteForTransfer(message.transferId, message.md5);
                     break;
                     
                 case 'file-verified':
@@ -943,7 +1106,7 @@ class FileTransfer {
         this.chunkSize = this.p2p.negotiatedChunkSize;
         this.totalBytes = info.size;
         this.totalChunks = Math.ceil(info.size / this.chunkSize);
-        this.chunks = new Array(this.totalChunks).fill(false);
+        this.chunks = new Uint8Array(this.totalChunks);
         
         this.logger.log(`Starting file reception: ${info.name} (${info.size} bytes)`);
         this.logger.log(`Using chunk size: ${this.chunkSize} bytes`);
@@ -970,8 +1133,9 @@ class FileTransfer {
         // Extract and store the numeric ID for chunk matching
         const numericId = this._extractTransferIdNumber(transferId);
         
-        // Create transfer data object for receiving
-        const chunkSize = this.p2p.negotiatedChunkSize;
+        // Create transfer data object for receiving, laid out with the sender's chunk size
+        // (peers that don't announce it use the negotiated size)
+        const chunkSize = info.chunkSize > 0 ? info.chunkSize : this.p2p.negotiatedChunkSize;
         const totalChunks = Math.ceil(info.size / chunkSize);
         
         const transferData = {
@@ -988,14 +1152,16 @@ class FileTransfer {
             chunkSize: chunkSize,
             totalBytes: info.size,
             totalChunks: totalChunks,
-            chunks: new Array(totalChunks).fill(false),
+            chunks: new Uint8Array(totalChunks), // 1 once a chunk has been received
             highestSequence: 0,
             fileData: new Uint8Array(info.size),
-            lastProgressUpdate: 0
+            lastProgressUpdate: 0,
+            lastProgressEmit: 0
         };
         
-        // Store transfer data using local transfer ID
+        // Store transfer data using local transfer ID, indexed by the numeric ID used in chunk headers
         this.activeTransfers.set(localTransferId, transferData);
+        this.receiveTransfersByNumericId.set(numericId, transferData);
         
         // Update legacy state for backward compatibility (for first transfer)
         if (this.activeTransfers.size === 1) {
@@ -1079,8 +1245,6 @@ class FileTransfer {
      * @private
      */
     _handleFlowControlAckForTransfer(ack) {
-        this.logger.log('DEBUG: _handleFlowControlAckForTransfer called with ack:', ack);
-        
         // Get transfer data
         const transferData = this.activeTransfers.get(ack.transferId);
         
@@ -1094,15 +1258,16 @@ class FileTransfer {
             return;
         }
         
-        this.logger.log('DEBUG: Received flow control acknowledgment for transfer:', ack.transferId, ack);
-        this.logger.log('DEBUG: Transfer', transferData.id, 'state before update - inFlightChunks:', transferData.inFlightChunks, 'lastAcknowledged:', transferData.lastAcknowledged);
-        
         // Update window control immediately (unthrottled)
         if (ack.highestSequence > transferData.lastAcknowledged) {
             const newAcknowledged = ack.highestSequence - transferData.lastAcknowledged;
             transferData.inFlightChunks = Math.max(0, transferData.inFlightChunks - newAcknowledged);
             transferData.lastAcknowledged = ack.highestSequence;
-            this.logger.log('DEBUG: Transfer', transferData.id, 'state after update - inFlightChunks:', transferData.inFlightChunks, 'lastAcknowledged:', transferData.lastAcknowledged);
+            
+            // Resume a send loop that is waiting for window space
+            if (transferData.windowSpaceResolve && transferData.inFlightChunks < transferData.windowSize) {
+                transferData.windowSpaceResolve();
+            }
         }
         
         // CRITICAL FIX: Remove legacy state updates to prevent conflicts
@@ -1350,22 +1515,10 @@ class FileTransfer {
             return;
         }
         
-        // CRITICAL FIX: Find transfer by numeric ID
-        let transferId = null;
-        let transferData = null;
-        
-        for (const [tid, tdata] of this.activeTransfers.entries()) {
-            if (!tdata.receiving) {
-                continue;
-            }
-            if (tdata.numericId === transferIdNum) {
-                transferId = tid;
-                transferData = tdata;
-                break;
-            }
-        }
+        // Find the receiving transfer by numeric ID without scanning all transfers
+        const transferData = this.receiveTransfersByNumericId.get(transferIdNum);
         
-        if (!transferData) {
+        if (!transferData || !transferData.receiving) {
             // Fallback to legacy handling ONLY for single transfers (not when multiple transfers are active)
             if (this.activeTransfers.size === 1 && this.receiving && this.fileInfo && this.fileData) {
                 this._handleLegacyDataMessage(data, view, sequence, chunkSize);
@@ -1377,7 +1530,31 @@ class FileTransfer {
         }
         
         // CRITICAL FIX: Handle data for specific transfer
-        this._handleDataMessageForTransfer(transferId, transferData, data, view, sequence, chunkSize);
+        this._handleDataMessageForTransfer(transferData.id, transferData, data, view, sequence, chunkSize);
+    }
+    
+    /**
+     * Stop receiving a transfer: drop it from the chunk lookup and release its receive buffer
+     * @param {Object} transferData - The transfer data
+     * @private
+     */
+    _endReceiveTransfer(transferData) {
+        transferData.receiving = false;
+        
+        if (transferData.flowControlAckTimer) {
+            clearTimeout(transferData.flowControlAckTimer);
+            transferData.flowControlAckTimer = null;
+        }
+        
+        // A newer transfer may have reused the numeric ID; only remove our own entry
+        if (this.receiveTransfersByNumericId.get(transferData.numericId) === transferData) {
+            this.receiveTransfersByNumericId.delete(transferData.numericId);
+        }
+        
+        if (this.fileData === transferData.fileData) {
+            this.fileData = null;
+        }
+        transferData.fileData = null;
     }
     
     /**
@@ -1408,7 +1585,7 @@ class FileTransfer {
         
         // Mark chunk as received
         if (!transferData.chunks[sequence]) {
-            transferData.chunks[sequence] = true;
+            transferData.chunks[sequence] = 1;
             transferData.receivedChunks++;
             transferData.bytesReceived += chunkSize;
             
@@ -1421,8 +1598,13 @@ class FileTransfer {
         // Send transfer-specific progress update (which includes flow control ack)
         this._sendProgressUpdateForTransfer(transferId, transferData);
         
-        // Update progress
-        if (this.onProgress) {
+        // Update progress, throttled so a fast channel doesn't drive a UI update per chunk;
+        // the final chunk is always reported
+        const now = Date.now();
+        const allReceived = transferData.bytesReceived >= transferData.totalBytes;
+        if (this.onProgress && (allReceived || now - transferData.lastProgressEmit >= this.progressEmitInterval)) {
+            transferData.lastProgressEmit = now;
+            const elapsedMs = now - transferData.startTime;
             const progress = {
                 transferId: transferId,
                 bytesReceived: transferData.bytesReceived,
@@ -1430,10 +1612,10 @@ class FileTransfer {
                 receivedChunks: transferData.receivedChunks,
                 totalChunks: transferData.totalChunks,
                 percent: (transferData.bytesReceived / transferData.totalBytes) * 100,
-                speed: transferData.bytesReceived / ((Date.now() - transferData.startTime) / 1000),
-                timeElapsed: (Date.now() - transferData.startTime) / 1000,
+                speed: transferData.bytesReceived / (elapsedMs / 1000),
+                timeElapsed: elapsedMs / 1000,
                 complete: transferData.transferComplete, // CRITICAL FIX: Include complete flag for UI synchronization
-                timeRemaining: ((Date.now() - transferData.startTime) / transferData.bytesReceived) * (transferData.totalBytes - transferData.bytesReceived) / 1000,
+                timeRemaining: (elapsedMs / transferData.bytesReceived) * (transferData.totalBytes - transferData.bytesReceived) / 1000,
                 filename: transferData.file.name
             };
             
@@ -1472,7 +1654,7 @@ class FileTransfer {
         
         // Mark chunk as received
         if (!this.chunks[sequence]) {
-            this.chunks[sequence] = true;
+            this.chunks[sequence] = 1;
             this.receivedChunks++;
             this.bytesReceived += chunkSize;
             
@@ -1523,6 +1705,11 @@ class FileTransfer {
             transferData.completionTimeout = null;
         }
         
+        // Nothing to verify once the transfer has ended and released its data
+        if (!transferData.fileData) {
+            return;
+        }
+        
         if (this.onVerificationStart) {
             this.onVerificationStart();
         }
@@ -1533,8 +1720,13 @@ class FileTransfer {
             // Create a blob from transfer-specific file data
             const blob = new Blob([transferData.fileData], { type: 'application/octet-stream' });
             
-            // Calculate MD5 hash
-            const md5Hash = await this._calculateMD5(blob);
+            // Calculate MD5 hash straight from the receive buffer rather than reading the blob back
+            const md5Hash = await this._calculateMD5ForBuffer(transferData.fileData);
+            
+            // The transfer may have been cancelled or torn down while hashing
+            if (!transferData.fileData) {
+                return;
+            }
             
             // Get file info from transfer data
             const fileInfo = {
@@ -1556,10 +1748,11 @@ class FileTransfer {
                     transferId: msgTransferId
                 };
                 
+                this._flushFlowControlAckForTransfer(transferId, transferData);
                 this.p2p.controlChannel.send(JSON.stringify(message));
                 
-                // Complete transfer
-                transferData.receiving = false;
+                // Complete transfer; the blob now holds the file data
+                this._endReceiveTransfer(transferData);
                 
                 // Send final progress update to ensure UI is synchronized
                 if (this.onProgress) {
@@ -1601,10 +1794,11 @@ class FileTransfer {
                     reason: 'MD5 hash mismatch'
                 };
                 
+                this._flushFlowControlAckForTransfer(transferId, transferData);
                 this.p2p.controlChannel.send(JSON.stringify(message));
                 
                 // Complete transfer with error
-                transferData.receiving = false;
+                this._endReceiveTransfer(transferData);
                 
                 if (this.onVerificationFailed) {
                     this.onVerificationFailed('MD5 hash mismatch');
@@ -1620,10 +1814,11 @@ class FileTransfer {
                 reason: error.message
             };
             
+            this._flushFlowControlAckForTransfer(transferId, transferData);
             this.p2p.controlChannel.send(JSON.stringify(message));
             
             // Complete transfer with error
-            transferData.receiving = false;
+            this._endReceiveTransfer(transferData);
             
             if (this.onVerificationFailed) {
                 this.onVerificationFailed(error.message);
@@ -1652,8 +1847,8 @@ class FileTransfer {
             // Create a blob from the file data
             const blob = new Blob([this.fileData], { type: 'application/octet-stream' });
             
-            // Calculate MD5 hash
-            const md5Hash = await this._calculateMD5(blob);
+            // Calculate MD5 hash straight from the receive buffer rather than reading the blob back
+            const md5Hash = await this._calculateMD5ForBuffer(this.fileData);
             
             // Compare with expected hash
             if (md5Hash === this.fileInfo.md5) {
@@ -1733,54 +1928,27 @@ class FileTransfer {
     }
 
     /**
-     * Calculate MD5 hash of a file or blob
-     * @param {File|Blob} file - The file or blob to hash
+     * Calculate MD5 hash of data already in memory
+     * @param {Uint8Array} data - The data to hash
      * @returns {Promise<string>} - The MD5 hash
      * @private
      */
-    async _calculateMD5(file) {
-        return new Promise((resolve, reject) => {
-            if (typeof SparkMD5 === 'undefined') {
-                reject(new Error('SparkMD5 library not loaded'));
-                return;
-            }
-
-            const chunkSize = 2 * 1024 * 1024; // 2MB chunks for large files
-            const chunks = Math.ceil(file.size / chunkSize);
-            let currentChunk = 0;
-            const spark = new SparkMD5.ArrayBuffer();
-            const reader = new FileReader();
-
-            reader.onload = (e) => {
-                try {
-                    spark.append(e.target.result);
-                    currentChunk++;
-
-                    if (currentChunk < chunks) {
-                        loadNext();
-                    } else {
-                        // All chunks processed, get the hash
-                        const hash = spark.end();
-                        resolve(hash);
-                    }
-                } catch (error) {
-                    reject(error);
-                }
-            };
-
-            reader.onerror = (e) => {
-                reject(new Error('Error reading file for MD5 calculation'));
-            };
-
-            const loadNext = () => {
-                const start = currentChunk * chunkSize;
-                const end = Math.min(start + chunkSize, file.size);
-                reader.readAsArrayBuffer(file.slice(start, end));
-            };
-
-            // Start processing
-            loadNext();
-        });
+    async _calculateMD5ForBuffer(data) {
+        if (typeof SparkMD5 === 'undefined') {
+            throw new Error('SparkMD5 library not loaded');
+        }
+        
+        const sliceSize = 8 * 1024 * 1024;
+        const spark = new SparkMD5.ArrayBuffer();
+        
+        for (let offset = 0; offset < data.byteLength; offset += sliceSize) {
+            spark.append(data.subarray(offset, Math.min(offset + sliceSize, data.byteLength)));
+            
+            // Yield between slices so large files don't freeze the page
+            await new Promise(resolve => setTimeout(resolve, 0));
+        }
+        
+        return spark.end();
     }
 
     /**
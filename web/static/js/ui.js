@@ -181,6 +181,25 @@ function initUI() {
     
     // Multiple transfer progress tracking
     let activeProgressIndicators = new Map(); // transferId -> DOM element
+    const progressIndicatorParts = new WeakMap(); // indicator element -> child elements updated on progress
+    
+    // Class names applied on every progress update, built once
+    const PROGRESS_BAR_CLASSES = {
+        sending: 'bg-blue-500 h-3 rounded-full transition-all duration-300',
+        receiving: 'bg-green-500 h-3 rounded-full transition-all duration-300',
+        complete: 'bg-green-500 h-3 rounded-full transition-all duration-300',
+        failed: 'bg-red-500 h-3 rounded-full transition-all duration-300'
+    };
+    const PROGRESS_STATUS_CLASSES = {
+        sending: 'text-sm text-blue-600 font-medium',
+        receiving: 'text-sm text-green-600 font-medium',
+        complete: 'text-sm text-green-600 font-medium',
+        failed: 'text-sm text-red-600 font-medium'
+    };
+    
+    // Latest progress per transfer, rendered at most once per animation frame
+    const pendingProgress = new Map(); // transferId ('' for legacy transfers) -> progress
+    let progressFrameId = 0; // Pending requestAnimationFrame handle, 0 when none
     
     // Auto-connect flag for URL-based connections
     let shouldAutoConnectToPeer = false;
@@ -208,25 +227,64 @@ function initUI() {
         }
     }
     
+    // Maximum number of lines kept in the status log
+    const MAX_LOG_ENTRIES = 100;
+    
+    // Maximum number of messages kept in the chat
+    const MAX_CHAT_MESSAGES = 1000;
+    
+    // Log entry class names per level, built once instead of for every entry
+    const LOG_ENTRY_CLASSES = {
+        info: 'log-entry info',
+        error: 'log-entry error',
+        warning: 'log-entry warning',
+        debug: 'log-entry debug'
+    };
+    
+    // Log entries waiting to be rendered on the next animation frame
+    const pendingLogEntries = [];
+    let logFrameRequested = false;
+    
     // Add log entry to the log container
     function addLogEntry(level, message) {
-        // Check current number of log entries and trim if exceeding 100
-        const currentEntries = elements.logContainer.children;
-        if (currentEntries.length >= 100) {
-            // Remove oldest entries to maintain maximum of 100 lines
-            const entriesToRemove = currentEntries.length - 99; // Keep 99 to make room for new entry
-            for (let i = 0; i < entriesToRemove; i++) {
-                elements.logContainer.removeChild(currentEntries[0]);
-            }
+        // Resolve the level's class name now so rendering is a plain copy
+        pendingLogEntries.push({ className: LOG_ENTRY_CLASSES[level], message });
+        
+        // Frames don't run in background tabs; keep no more than could be displayed
+        if (pendingLogEntries.length > MAX_LOG_ENTRIES) {
+            pendingLogEntries.shift();
         }
         
-        const entry = document.createElement('div');
-        entry.className = `log-entry ${level}`;
-        entry.textContent = message;
-        elements.logContainer.appendChild(entry);
+        if (!logFrameRequested) {
+            logFrameRequested = true;
+            requestAnimationFrame(renderPendingLogEntries);
+        }
+    }
+    
+    // Append all pending log entries in one DOM update
+    function renderPendingLogEntries() {
+        logFrameRequested = false;
         
-        // Smooth scrolling to bottom after adding new entry
-        elements.logContainer.scrollTop = elements.logContainer.scrollHeight;
+        const fragment = document.createDocumentFragment();
+        for (const { className, message } of pendingLogEntries) {
+            const entry = document.createElement('div');
+            entry.className = className;
+            entry.textContent = message;
+            fragment.appendChild(entry);
+        }
+        pendingLogEntries.length = 0;
+        
+        // Remove oldest entries to make room for the new ones
+        const container = elements.logContainer;
+        const added = fragment.childElementCount;
+        while (container.firstElementChild && container.childElementCount + added > MAX_LOG_ENTRIES) {
+            container.removeChild(container.firstElementChild);
+        }
+        
+        container.appendChild(fragment);
+        
+        // Scroll to bottom once for the whole batch
+        container.scrollTop = container.scrollHeight;
     }
     
     // Add transfer to history
@@ -243,57 +301,63 @@ function initUI() {
         
         // Keep only last 10 transfers
         if (transferHistory.length > 10) {
-            transferHistory = transferHistory.slice(0, 10);
+            transferHistory.length = 10;
         }
         
-        updateHistoryDisplay();
+        updateHistoryDisplay(historyItem);
     }
     
-    // Update history display
-    function updateHistoryDisplay() {
+    // Update history display with a newly added item; existing entries are left in place
+    function updateHistoryDisplay(newItem) {
         const historyList = document.getElementById('transfer-history-list');
         
-        if (transferHistory.length === 0) {
-            historyList.innerHTML = '<div class="text-sm text-gray-500 italic">No transfers completed yet</div>';
-            return;
+        // Replace the empty-history placeholder on the first entry
+        if (!historyList.firstElementChild || !historyList.firstElementChild.dataset.historyId) {
+            historyList.innerHTML = '';
         }
         
-        historyList.innerHTML = '';
+        historyList.prepend(createHistoryEntry(newItem));
         
-        transferHistory.forEach(item => {
-            const historyEntry = document.createElement('div');
-            historyEntry.className = 'p-3 bg-gray-50 rounded-md border border-gray-200';
-            
-            const isReceived = item.type === 'received';
-            const statusIcon = isReceived ? '↓' : '↑';
-            const directionColor = isReceived ? 'text-green-600' : 'text-blue-600';
-            const statusLabel = item.status || (isReceived ? 'Received' : 'Sent');
-            const statusColor = item.status === 'Cancelled' ? 'text-red-600' : directionColor;
-            
-            historyEntry.innerHTML = `
-                <div class="flex justify-between items-start">
-                    <div class="flex-1">
-                        <div class="flex items-center mb-1">
-                            <span class="${directionColor} font-medium mr-2">${statusIcon}</span>
-                            <span class="font-medium text-gray-900">${item.filename}</span>
-                        </div>
-                        <div class="text-sm text-gray-600">
-                            <span class="mr-3">${item.filesize}</span>
-                            <span class="mr-3">${item.speed}</span>
-                            <span class="mr-3 ${statusColor} font-medium">${statusLabel}</span>
-                            <span class="text-xs text-gray-500">${item.timestamp}</span>
-                        </div>
+        while (historyList.childElementCount > transferHistory.length) {
+            historyList.removeChild(historyList.lastElementChild);
+        }
+    }
+    
+    // Create the DOM element for a history item
+    function createHistoryEntry(item) {
+        const historyEntry = document.createElement('div');
+        historyEntry.className = 'p-3 bg-gray-50 rounded-md border border-gray-200';
+        historyEntry.dataset.historyId = item.id;
+        
+        const isReceived = item.type === 'received';
+        const statusIcon = isReceived ? '↓' : '↑';
+        const directionColor = isReceived ? 'text-green-600' : 'text-blue-600';
+        const statusLabel = item.status || (isReceived ? 'Received' : 'Sent');
+        const statusColor = item.status === 'Cancelled' ? 'text-red-600' : directionColor;
+        
+        historyEntry.innerHTML = `
+            <div class="flex justify-between items-start">
+                <div class="flex-1">
+                    <div class="flex items-center mb-1">
+                        <span class="${directionColor} font-medium mr-2">${statusIcon}</span>
+                        <span class="font-medium text-gray-900">${item.filename}</span>
+                    </div>
+                    <div class="text-sm text-gray-600">
+                        <span class="mr-3">${item.filesize}</span>
+                        <span class="mr-3">${item.speed}</span>
+                        <span class="mr-3 ${statusColor} font-medium">${statusLabel}</span>
+                        <span class="text-xs text-gray-500">${item.timestamp}</span>
                     </div>
-                    ${item.downloadUrl ? `
-                        <button onclick="downloadFromHistory('${item.id}')" class="ml-2 bg-blue-500 text-white px-3 py-1 rounded text-sm hover:bg-blue-600 focus:outline-none focus:ring-2 focus:ring-blue-500 focus:ring-opacity-50">
-                            Download
-                        </button>
-                    ` : ''}
                 </div>
-            `;
-            
-            historyList.appendChild(historyEntry);
-        });
+                ${item.downloadUrl ? `
+                    <button onclick="downloadFromHistory('${item.id}')" class="ml-2 bg-blue-500 text-white px-3 py-1 rounded text-sm hover:bg-blue-600 focus:outline-none focus:ring-2 focus:ring-blue-500 focus:ring-opacity-50">
+                        Download
+                    </button>
+                ` : ''}
+            </div>
+        `;
+        
+        return historyEntry;
     }
     
     // Download file from history
@@ -320,16 +384,16 @@ function initUI() {
     };
     
     // Format bytes to human-readable format
+    const BYTE_UNITS = ['B', 'KB', 'MB', 'GB', 'TB', 'PB', 'EB', 'ZB', 'YB'];
+    const LOG_1024 = Math.log(1024);
+    
     function formatBytes(bytes, decimals = 2) {
         if (bytes === 0) return '0.00 B';
         
-        const k = 1024;
         const dm = decimals < 0 ? 0 : decimals;
-        const sizes = ['B', 'KB', 'MB', 'GB', 'TB', 'PB', 'EB', 'ZB', 'YB'];
+        const i = Math.floor(Math.log(bytes) / LOG_1024);
         
-        const i = Math.floor(Math.log(bytes) / Math.log(k));
-        
-        return (bytes / Math.pow(k, i)).toFixed(dm) + ' ' + sizes[i];
+        return (bytes / Math.pow(1024, i)).toFixed(dm) + ' ' + BYTE_UNITS[i];
     }
     
     // Format seconds to MM:SS format
@@ -461,6 +525,15 @@ function initUI() {
     p2p.onPeerDisconnect = () => {
         logger.warn('Peer connection closed');
         
+        // Stop transfers that can no longer make progress and release their buffers
+        fileTransfer.abortAllTransfers();
+        
+        // Drop queued updates and the indicators of transfers that no longer exist
+        pendingProgress.clear();
+        for (const transferId of Array.from(activeProgressIndicators.keys())) {
+            removeProgressIndicator(transferId);
+        }
+        
         // Show disconnection modal
         if (elements.disconnectionModal) {
             elements.disconnectionModal.classList.remove('hidden');
@@ -469,16 +542,41 @@ function initUI() {
     
     // File transfer event handlers
     fileTransfer.onProgress = (progress) => {
-        // Check if this is a multi-transfer progress update
-        if (progress.transferId) {
-            // Handle multiple transfer progress
-            updateMultipleTransferProgress(progress);
-        } else {
-            // Handle legacy single transfer progress
-            updateSingleTransferProgress(progress);
+        // Per-chunk updates only record the latest state; rendering happens once per frame
+        pendingProgress.set(progress.transferId || '', progress);
+        
+        if (!progressFrameId) {
+            progressFrameId = requestAnimationFrame(renderPendingProgress);
         }
     };
     
+    // Render the latest recorded progress of every transfer
+    function renderPendingProgress() {
+        progressFrameId = 0;
+        
+        for (const progress of pendingProgress.values()) {
+            // Check if this is a multi-transfer progress update
+            if (progress.transferId) {
+                // Handle multiple transfer progress
+                updateMultipleTransferProgress(progress);
+            } else {
+                // Handle legacy single transfer progress
+                updateSingleTransferProgress(progress);
+            }
+        }
+        
+        pendingProgress.clear();
+    }
+    
+    // Render queued progress now, before a final state is shown, so a later frame cannot
+    // overwrite it; the frame scheduled for that progress is no longer needed
+    function flushPendingProgress() {
+        if (progressFrameId) {
+            cancelAnimationFrame(progressFrameId);
+            renderPendingProgress();
+        }
+    }
+    
     // Update single transfer progress (legacy compatibility)
     function updateSingleTransferProgress(progress) {
         // Update progress bar
@@ -576,66 +674,82 @@ function initUI() {
             </div>
         `;
         
+        progressIndicatorParts.set(indicator, {
+            progressBar: indicator.querySelector('[data-role="transfer-progress-bar"]'),
+            statusElement: indicator.querySelector('[data-role="transfer-status"]'),
+            bytesElement: indicator.querySelector('[data-role="transfer-bytes"]'),
+            speedElement: indicator.querySelector('[data-role="transfer-speed"]'),
+            timeElement: indicator.querySelector('[data-role="transfer-time"]'),
+            rendered: {} // Values last written to the elements above
+        });
+        
         container.appendChild(indicator);
         return indicator;
     }
     
     // Update an existing progress indicator
     function updateProgressIndicator(indicator, progress) {
-        const progressBar = indicator.querySelector('[data-role="transfer-progress-bar"]');
-        const statusElement = indicator.querySelector('[data-role="transfer-status"]');
-        const bytesElement = indicator.querySelector('[data-role="transfer-bytes"]');
-        const speedElement = indicator.querySelector('[data-role="transfer-speed"]');
-        const timeElement = indicator.querySelector('[data-role="transfer-time"]');
+        const parts = progressIndicatorParts.get(indicator);
+        const { progressBar, statusElement, bytesElement, speedElement, timeElement, rendered } = parts;
         
         const isSending = progress.bytesSent !== undefined;
         const bytesTransferred = isSending ? progress.bytesSent : progress.bytesReceived;
-        const statusColor = isSending ? 'text-blue-600' : 'text-green-600';
-        const progressBarColor = isSending ? 'bg-blue-500' : 'bg-green-500';
+        const direction = isSending ? 'sending' : 'receiving';
+        
+        // CRITICAL FIX: Update progress indicator status when complete
+        const complete = progress.complete || progress.percent === 100;
+        
+        // Work out what the indicator should show; the bar moves in 0.1% steps
+        const barWidth = complete ? '100%' : `${progress.percent.toFixed(1)}%`;
+        const barClass = complete ? PROGRESS_BAR_CLASSES.complete : PROGRESS_BAR_CLASSES[direction];
+        const statusText = complete ? 'Complete' : (isSending ? 'Sending...' : 'Receiving...');
+        const statusClass = complete ? PROGRESS_STATUS_CLASSES.complete : PROGRESS_STATUS_CLASSES[direction];
+        const bytesText = `${formatBytes(bytesTransferred)} / ${formatBytes(progress.totalBytes)}`;
+        const speedText = `${formatBytes(progress.speed)}/s`;
+        const timeText = complete ? '00:00' : formatTime(progress.timeRemaining);
 
-        // Update progress bar
+        // Only touch the DOM for values that changed since the last render
         if (progressBar) {
-            progressBar.style.width = `${progress.percent}%`;
-            progressBar.className = `${progressBarColor} h-3 rounded-full transition-all duration-300`;
+            if (rendered.barWidth !== barWidth) {
+                progressBar.style.width = barWidth;
+                rendered.barWidth = barWidth;
+            }
+            if (rendered.barClass !== barClass) {
+                progressBar.className = barClass;
+                rendered.barClass = barClass;
+            }
         }
 
-        // Update status
         if (statusElement) {
-            statusElement.textContent = isSending ? 'Sending...' : 'Receiving...';
-            statusElement.className = `text-sm ${statusColor} font-medium`;
+            if (rendered.statusText !== statusText) {
+                statusElement.textContent = statusText;
+                rendered.statusText = statusText;
+            }
+            if (rendered.statusClass !== statusClass) {
+                statusElement.className = statusClass;
+                rendered.statusClass = statusClass;
+            }
         }
         
-        // Update stats with null checks
-        if (bytesElement) {
-            bytesElement.textContent = `${formatBytes(bytesTransferred)} / ${formatBytes(progress.totalBytes)}`;
-        }
-        if (speedElement) {
-            speedElement.textContent = `${formatBytes(progress.speed)}/s`;
+        if (bytesElement && rendered.bytesText !== bytesText) {
+            bytesElement.textContent = bytesText;
+            rendered.bytesText = bytesText;
         }
-        if (timeElement) {
-            timeElement.textContent = formatTime(progress.timeRemaining);
+        if (speedElement && rendered.speedText !== speedText) {
+            speedElement.textContent = speedText;
+            rendered.speedText = speedText;
         }
-        
-        // CRITICAL FIX: Update progress indicator status when complete
-        if (progress.complete || progress.percent === 100) {
-            if (progressBar) {
-                progressBar.style.width = '100%';
-                progressBar.className = 'bg-green-500 h-3 rounded-full transition-all duration-300';
-            }
-
-            if (statusElement) {
-                statusElement.textContent = 'Complete';
-                statusElement.className = 'text-sm text-green-600 font-medium';
-            }
-            
-            if (timeElement) {
-                timeElement.textContent = '00:00';
-            }
+        if (timeElement && rendered.timeText !== timeText) {
+            timeElement.textContent = timeText;
+            rendered.timeText = timeText;
         }
     }
     
     // Remove a progress indicator
     function removeProgressIndicator(transferId) {
+        // Drop any queued update so it cannot recreate the indicator
+        pendingProgress.delete(transferId);
+        
         const indicator = activeProgressIndicators.get(transferId);
         if (indicator) {
             indicator.remove();
@@ -667,35 +781,47 @@ function initUI() {
         transfer.historyRecorded = true;
     }
     
-    function markProgressIndicatorCancelled(transferId, statusText) {
-        const indicator = activeProgressIndicators.get(transferId);
-        if (!indicator) {
-            return;
-        }
-        const progressBar = indicator.querySelector('[data-role="transfer-progress-bar"]');
-        const statusElement = indicator.querySelector('[data-role="transfer-status"]');
-        const timeElement = indicator.querySelector('[data-role="transfer-time"]');
+    // Show the cancelled or failed state through the cached elements, keeping the render cache in step
+    function showProgressIndicatorFailure(indicator, statusText, timeText) {
+        const { progressBar, statusElement, timeElement, rendered } = progressIndicatorParts.get(indicator);
+        
         if (progressBar) {
             progressBar.style.width = '100%';
-            progressBar.className = 'bg-red-500 h-3 rounded-full transition-all duration-300';
+            rendered.barWidth = '100%';
+            progressBar.className = PROGRESS_BAR_CLASSES.failed;
+            rendered.barClass = PROGRESS_BAR_CLASSES.failed;
         }
         if (statusElement) {
             statusElement.textContent = statusText;
-            statusElement.className = 'text-sm text-red-600 font-medium';
+            rendered.statusText = statusText;
+            statusElement.className = PROGRESS_STATUS_CLASSES.failed;
+            rendered.statusClass = PROGRESS_STATUS_CLASSES.failed;
         }
-        if (timeElement) {
-            timeElement.textContent = '--:--';
+        if (timeElement && timeText) {
+            timeElement.textContent = timeText;
+            rendered.timeText = timeText;
         }
+        
         const cancelButton = indicator.querySelector('button');
         if (cancelButton) {
             cancelButton.remove();
         }
+    }
+    
+    function markProgressIndicatorCancelled(transferId, statusText) {
+        const indicator = activeProgressIndicators.get(transferId);
+        if (!indicator) {
+            return;
+        }
+        showProgressIndicatorFailure(indicator, statusText, '--:--');
         setTimeout(() => {
             removeProgressIndicator(transferId);
         }, 2000);
     }
     
     function handleTransferCancellation(transferId, transfer, statusText) {
+        flushPendingProgress();
+        
         addTransferCancellationToHistory(transfer, statusText);
         markProgressIndicatorCancelled(transferId, statusText);
         if (elements.transferStatus) {
@@ -729,6 +855,8 @@ function initUI() {
     };
     
     fileTransfer.onComplete = () => {
+        flushPendingProgress();
+        
         // Handle multiple transfer completion
         const completedTransfers = Array.from(fileTransfer.activeTransfers.values())
             .filter(t => t.transferComplete && !t.completedHandled);
@@ -838,6 +966,8 @@ function initUI() {
     };
     
     fileTransfer.onError = (error) => {
+        flushPendingProgress();
+        
         const messageText = error && error.message ? error.message : '';
         const failedTransfer = Array.from(fileTransfer.activeTransfers.values())
             .find(t => t.transferCancelled || (t.sending && (messageText.includes('cancelled') || messageText.includes('verification'))));
@@ -850,20 +980,7 @@ function initUI() {
             }
             const progressElement = activeProgressIndicators.get(failedTransfer.id);
             if (progressElement) {
-                const progressBar = progressElement.querySelector('[data-role="transfer-progress-bar"]');
-                const statusElement = progressElement.querySelector('[data-role="transfer-status"]');
-                if (progressBar) {
-                    progressBar.style.width = '100%';
-                    progressBar.className = 'bg-red-500 h-3 rounded-full transition-all duration-300';
-                }
-                if (statusElement) {
-                    statusElement.textContent = `Error: ${messageText}`;
-                    statusElement.className = 'text-sm text-red-600 font-medium';
-                }
-                const cancelButton = progressElement.querySelector('button');
-                if (cancelButton) {
-                    cancelButton.remove();
-                }
+                showProgressIndicatorFailure(progressElement, `Error: ${messageText}`);
                 setTimeout(() => {
                     removeProgressIndicator(failedTransfer.id);
                 }, 3000);
@@ -908,6 +1025,8 @@ function initUI() {
     };
     
     fileTransfer.onVerificationComplete = (blob, fileInfo) => {
+        flushPendingProgress();
+        
         if (elements.transferStatus) {
             elements.transferStatus.textContent = 'Verified';
         }
@@ -1163,12 +1282,18 @@ function initUI() {
     
     // Add chat message
     function addChatMessage(message, sent) {
+        // Drop the oldest messages so a long session doesn't grow the chat without bound
+        const container = elements.chatMessages;
+        while (container.childElementCount >= MAX_CHAT_MESSAGES) {
+            container.removeChild(container.firstElementChild);
+        }
+        
         const messageElement = document.createElement('div');
         messageElement.className = `message ${sent ? 'sent' : 'received'}`;
         messageElement.textContent = message;
         
-        elements.chatMessages.appendChild(messageElement);
-        elements.chatMessages.scrollTop = elements.chatMessages.scrollHeight;
+        container.appendChild(messageElement);
+        container.scrollTop = container.scrollHeight;
     }
     
     // Show transfer completion status
@@ -1391,36 +1516,18 @@ function initUI() {
         
         // Update server connection indicator
         if (p2p.isServerConnected()) {
-            serverIndicator.className = 'inline-flex items-center px-2 py-1 rounded-full text-xs font-medium bg-green-100 text-green-800';
-            serverIndicator.innerHTML = `
-                <svg class="w-3 h-3 mr-1" fill="currentColor" viewBox="0 0 20 20">
-                    <circle cx="10" cy="10" r="3"></circle>
-                </svg>
-                Server: Connected
-            `;
+            _renderIndicator(serverIndicator, 'bg-green-100 text-green-800', 'Server: Connected');
             // Disable connect button when connected
             elements.connectButton.disabled = true;
             elements.serverUrl.disabled = true;
         } else if (p2p.serverDisconnected) {
-            serverIndicator.className = 'inline-flex items-center px-2 py-1 rounded-full text-xs font-medium bg-gray-100 text-gray-800';
-            serverIndicator.innerHTML = `
-                <svg class="w-3 h-3 mr-1" fill="currentColor" viewBox="0 0 20 20">
-                    <circle cx="10" cy="10" r="3"></circle>
-                </svg>
-                Server: Disconnected
-            `;
+            _renderIndicator(serverIndicator, 'bg-gray-100 text-gray-800', 'Server: Disconnected');
             // Re-enable connect button when disconnected
             elements.connectButton.disabled = false;
             elements.serverUrl.disabled = false;
             elements.connectButton.textContent = 'Connect to Server';
         } else {
-            serverIndicator.className = 'inline-flex items-center px-2 py-1 rounded-full text-xs font-medium bg-red-100 text-red-800';
-            serverIndicator.innerHTML = `
-                <svg class="w-3 h-3 mr-1" fill="currentColor" viewBox="0 0 20 20">
-                    <circle cx="10" cy="10" r="3"></circle>
-                </svg>
-                Server: Not Connected
-            `;
+            _renderIndicator(serverIndicator, 'bg-red-100 text-red-800', 'Server: Not Connected');
             // Re-enable connect button when not connected
             elements.connectButton.disabled = false;
             elements.serverUrl.disabled = false;
@@ -1429,21 +1536,33 @@ function initUI() {
         
         // Update P2P connection indicator
         if (p2p.isConnected()) {
-            p2pIndicator.className = 'inline-flex items-center px-2 py-1 rounded-full text-xs font-medium bg-green-100 text-green-800';
-            p2pIndicator.innerHTML = `
-                <svg class="w-3 h-3 mr-1" fill="currentColor" viewBox="0 0 20 20">
-                    <circle cx="10" cy="10" r="3"></circle>
-                </svg>
-                P2P: Connected
-            `;
+            _renderIndicator(p2pIndicator, 'bg-green-100 text-green-800', 'P2P: Connected');
+        } else {
+            _renderIndicator(p2pIndicator, 'bg-red-100 text-red-800', 'P2P: Not Connected');
+        }
+    }
+    
+    /**
+     * Render a connection indicator, skipping the DOM rewrite when its state is unchanged
+     * @param {HTMLElement} indicator - The indicator element
+     * @param {string} colorClasses - The background and text color classes
+     * @param {string} label - The indicator label
+     * @private
+     */
+    function _renderIndicator(indicator, colorClasses, label) {
+        if (indicator.dataset.label === label) {
+            return;
+        }
+        indicator.dataset.label = label;
+        
+        indicator.className = `inline-flex items-center px-2 py-1 rounded-full text-xs font-medium ${colorClasses}`;
+        
+        // The status dot never changes; replace only the trailing label text instead of re-parsing the markup
+        const labelNode = indicator.lastChild;
+        if (labelNode && labelNode.nodeType === Node.TEXT_NODE) {
+            labelNode.nodeValue = label;
         } else {
-            p2pIndicator.className = 'inline-flex items-center px-2 py-1 rounded-full text-xs font-medium bg-red-100 text-red-800';
-            p2pIndicator.innerHTML = `
-                <svg class="w-3 h-3 mr-1" fill="currentColor" viewBox="0 0 20 20">
-                    <circle cx="10" cy="10" r="3"></circle>
-                </svg>
-                P2P: Not Connected
-            `;
+            indicator.appendChild(document.createTextNode(label));
         }
     }
     
@@ -43,9 +43,10 @@ class P2PConnection {
 
         // Buffer size configuration as per protocol
         this.CONTROL_BUFFER_SIZE = 256 * 1024; // 256KB for control channel
-        this.DATA_BUFFER_SIZE = 1024 * 1024; // 1MB for data channel
+        this.DATA_BUFFER_SIZE = 2 * 1024 * 1024; // 2MB for data channel (practical browser send queue cap)
 
         // Chunk size constants as defined in the protocol
+        this.CHUNK_HEADER_SIZE = 12; // 4 bytes transfer ID + 4 bytes sequence + 4 bytes chunk size
         this.MIN_CHUNK_SIZE = 4096;   // 4KB minimum
         this.DEFAULT_CHUNK_SIZE = 16384;  // 16KB default
         this.MAX_CHUNK_SIZE = 262144; // 256KB maximum
@@ -69,6 +70,7 @@ class P2PConnection {
         this.logger = logger || console;
         this.pendingICECandidates = [];
         this.connectionAccepted = false;
+        this.signalingQueue = Promise.resolve(); // Remote offer/answer/ICE operations, applied in arrival order
         
         // Server disconnection state tracking
         this.serverConnected = false;
@@ -389,12 +391,8 @@ class P2PConnection {
             throw new Error('Control channel not open');
         }
 
-        const message = {
-            type: 'message',
-            content: content
-        };
-
-        this.controlChannel.send(JSON.stringify(message));
+        // Only the content needs encoding; the envelope around it is fixed
+        this.controlChannel.send('{"type":"message","content":' + JSON.stringify(content) + '}');
         this.logger.log('Sent chat message:', content);
     }
 
@@ -422,6 +420,9 @@ class P2PConnection {
             }, 5000);
         });
 
+        // Advertise the largest chunk the SCTP transport lets us send in one message
+        this.maxChunkSize = this._getLocalMaxChunkSize();
+
         const message = {
             type: 'capabilities',
             maxChunkSize: this.maxChunkSize
@@ -618,9 +619,9 @@ class P2PConnection {
                 }
             );
             
-            // Set buffer size for data channel (1MB) with optimized threshold
+            // Set buffer size for data channel (2MB); senders resume on bufferedamountlow
             if (this.dataChannel.bufferedAmountLowThreshold !== undefined) {
-                this.dataChannel.bufferedAmountLowThreshold = this.DATA_BUFFER_SIZE / 8; // 12.5% threshold for better flow
+                this.dataChannel.bufferedAmountLowThreshold = this.DATA_BUFFER_SIZE / 4; // 25% threshold, two max-size chunks
             }
             
             this._setupDataChannel(this.dataChannel);
@@ -674,15 +675,21 @@ class P2PConnection {
         channel.onmessage = (event) => {
             let data = event.data;
             
+            // Control messages are JSON objects; drop anything else rather than letting
+            // JSON.parse throw on it
+            if (typeof data === 'string' && data.trimStart().charCodeAt(0) !== 123 /* '{' */) {
+                this.logger.warn('Ignoring non-JSON control message');
+                return;
+            }
+            
             try {
-                // Try to parse as JSON
+                // Parse as JSON
                 if (typeof data === 'string') {
                     const jsonData = JSON.parse(data);
-                    this.logger.log('Received control message:', jsonData.type);
                     
-                    // DEBUG: Log flow control acks specifically
-                    if (jsonData.type === 'flow-control-ack') {
-                        this.logger.log('DEBUG: Received flow-control-ack:', jsonData);
+                    // Flow control acks arrive continuously during a transfer and are not logged
+                    if (jsonData.type !== 'flow-control-ack') {
+                        this.logger.log('Received control message:', jsonData.type);
                     }
                     
                     // Handle specific message types
@@ -713,11 +720,8 @@ class P2PConnection {
                     }
                 }
             } catch (error) {
+                // The control handler would only fail to parse it again
                 this.logger.error('Error parsing control message:', error);
-                // Still pass the raw data to the control handler
-                if (this.onControlMessage) {
-                    this.onControlMessage(data);
-                }
             }
         };
     }
@@ -771,24 +775,7 @@ class P2PConnection {
             const data = event.data;
             
             if (data instanceof ArrayBuffer) {
-                this.logger.log(`Received binary data: ${data.byteLength} bytes`);
-                
-                // Extract transfer ID, sequence number and size if possible
-                if (data.byteLength >= 12) {
-                    const view = new DataView(data);
-                    const transferId = view.getUint32(0);
-                    const sequence = view.getUint32(4);
-                    const chunkSize = view.getUint32(8);
-                    this.logger.log(`Data appears to be chunk ${sequence} for transfer ${transferId} with size ${chunkSize}`);
-                } else if (data.byteLength >= 8) {
-                    // Legacy format without transfer ID
-                    const view = new DataView(data);
-                    const sequence = view.getUint32(0);
-                    const chunkSize = view.getUint32(4);
-                    this.logger.log(`Data appears to be legacy chunk ${sequence} with size ${chunkSize}`);
-                }
-                
-                // Pass to data handler
+                // Pass to data handler, which decodes and validates the chunk header
                 if (this.onDataMessage) {
                     this.onDataMessage(data);
                 }
@@ -812,6 +799,9 @@ class P2PConnection {
         
         this.logger.log('Received capabilities from peer, max chunk size:', peerMaxChunkSize);
         
+        // The peer's capabilities may arrive before our control channel opened
+        this.maxChunkSize = this._getLocalMaxChunkSize();
+        
         // Negotiate chunk size (minimum of both peers)
         const negotiatedSize = Math.min(this.maxChunkSize, peerMaxChunkSize);
         
@@ -851,6 +841,24 @@ class P2PConnection {
         this._checkAndDisconnectFromServer();
     }
 
+    /**
+     * Determine the largest chunk size that fits in a single SCTP message
+     * @returns {number} - The maximum chunk size in bytes
+     * @private
+     */
+    _getLocalMaxChunkSize() {
+        const sctp = this.peerConnection ? this.peerConnection.sctp : null;
+        
+        // Without SCTP transport information (older browsers) stay with the interoperable default
+        if (!sctp || !sctp.maxMessageSize) {
+            return this.DEFAULT_CHUNK_SIZE;
+        }
+        
+        // Leave room for the chunk header and keep the chunk size KB aligned
+        const maxPayload = Math.floor((sctp.maxMessageSize - this.CHUNK_HEADER_SIZE) / 1024) * 1024;
+        return Math.max(this.MIN_CHUNK_SIZE, Math.min(this.MAX_CHUNK_SIZE, maxPayload));
+    }
+
     /**
      * Handle capabilities acknowledgment from peer
      * @param {Object} ack - The capabilities acknowledgment message
@@ -935,7 +943,7 @@ class P2PConnection {
         const message = {
             type: 'ice',
             peerToken: this.peerToken,
-            ice: JSON.stringify(candidate)
+            ice: candidate
         };
         
         this.signaler.send(JSON.stringify(message));
@@ -1025,53 +1033,35 @@ class P2PConnection {
                         this.logger.log('Setting peer token to:', this.peerToken);
                     }
                     
-                    // Parse the offer
-                    const offer = JSON.parse(message.sdp);
+                    const offer = this._decodeSignalingPayload(message.sdp);
                     
-                    // Set remote description
-                    this.peerConnection.setRemoteDescription(new RTCSessionDescription(offer))
-                        .then(() => {
-                            // Create answer
-                            return this.peerConnection.createAnswer();
-                        })
-                        .then(answer => {
-                            // Set local description
-                            return this.peerConnection.setLocalDescription(answer);
-                        })
-                        .then(() => {
-                            // Send answer
-                            this._sendAnswer(this.peerConnection.localDescription);
-                        })
-                        .catch(error => {
-                            this.logger.error('Error handling offer:', error);
-                            if (this.onError) {
-                                this.onError('Error handling offer: ' + error.message);
-                            }
-                        });
+                    this._queueSignalingOperation('handling offer', async () => {
+                        // Set remote description
+                        await this.peerConnection.setRemoteDescription(new RTCSessionDescription(offer));
+                        
+                        // Create answer and set it as local description
+                        const answer = await this.peerConnection.createAnswer();
+                        await this.peerConnection.setLocalDescription(answer);
+                        
+                        // Send answer
+                        this._sendAnswer(this.peerConnection.localDescription);
+                    });
                     break;
                     
                 case 'answer':
                     this.logger.log('Received answer from:', message.token);
-                    const answer = JSON.parse(message.sdp);
-                    this.peerConnection.setRemoteDescription(new RTCSessionDescription(answer))
-                        .catch(error => {
-                            this.logger.error('Error setting remote description:', error);
-                            if (this.onError) {
-                                this.onError('Error setting remote description: ' + error.message);
-                            }
-                        });
+                    const answer = this._decodeSignalingPayload(message.sdp);
+                    this._queueSignalingOperation('setting remote description', () =>
+                        this.peerConnection.setRemoteDescription(new RTCSessionDescription(answer))
+                    );
                     break;
                     
                 case 'ice':
                     this.logger.log('Received ICE candidate from:', message.token);
-                    const candidate = JSON.parse(message.ice);
-                    this.peerConnection.addIceCandidate(new RTCIceCandidate(candidate))
-                        .catch(error => {
-                            this.logger.error('Error adding ICE candidate:', error);
-                            if (this.onError) {
-                                this.onError('Error adding ICE candidate: ' + error.message);
-                            }
-                        });
+                    const candidate = this._decodeSignalingPayload(message.ice);
+                    this._queueSignalingOperation('adding ICE candidate', () =>
+                        this.peerConnection.addIceCandidate(new RTCIceCandidate(candidate))
+                    );
                     break;
             }
         } catch (error) {
@@ -1082,6 +1072,36 @@ class P2PConnection {
         }
     }
 
+    /**
+     * Get the SDP or ICE object carried by a signaling message. Current peers send it
+     * inline; older clients sent it as a JSON string that needs a second parse.
+     * @param {Object|string} payload - The sdp or ice field of the message
+     * @returns {Object} - The session description or candidate init object
+     * @private
+     */
+    _decodeSignalingPayload(payload) {
+        return typeof payload === 'string' ? JSON.parse(payload) : payload;
+    }
+
+    /**
+     * Run a peer connection operation for a signaling message after the operations for
+     * earlier messages have settled, so ICE candidates are never applied before the
+     * remote description they belong to. The websocket handler itself never waits.
+     * @param {string} description - What the operation does, for error reporting
+     * @param {Function} operation - Returns a promise for the operation
+     * @private
+     */
+    _queueSignalingOperation(description, operation) {
+        this.signalingQueue = this.signalingQueue
+            .then(operation)
+            .catch(error => {
+                this.logger.error(`Error ${description}:`, error);
+                if (this.onError) {
+                    this.onError(`Error ${description}: ` + error.message);
+                }
+            });
+    }
+
     /**
      * Check P2P connection stability and disconnect from server if appropriate
      * @private
@@ -1156,7 +1176,7 @@ class P2PConnection {
         const message = {
             type: 'offer',
             peerToken: this.peerToken,
-            sdp: JSON.stringify(offer)
+            sdp: offer
         };
         
         this.signaler.send(JSON.stringify(message));
@@ -1180,7 +1200,7 @@ class P2PConnection {
         const message = {
             type: 'answer',
             peerToken: this.peerToken,
-            sdp: JSON.stringify(answer)
+            sdp: answer
         };
         
         this.signaler.send(JSON.stringify(message));